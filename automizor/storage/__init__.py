@@ -1,12 +1,13 @@
-import json
 import mimetypes
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from automizor.utils import JSON
+from automizor.utils import JSON, json_dumps
 
 from ._storage import Storage
 
+_content_types: Dict[str, str] = {}
+
 
 def configure(api_token: str):
     """
@@ -124,14 +125,11 @@ def set_file(name: str, path: str, content_type: Optional[str] = None):
         content_type: The MIME type of the asset.
     """
 
-    content = Path(path).read_bytes()
     if not content_type:
-        content_type, _ = mimetypes.guess_type(path)
-        if content_type is None:
-            content_type = "application/octet-stream"
+        content_type = _guess_content_type(path)
 
     storage = Storage.get_instance()
-    storage.set_bytes(name, content, content_type)
+    storage.set_file(name, path, content_type)
 
 
 def set_json(name: str, value: JSON, **kwargs):
@@ -144,7 +142,7 @@ def set_json(name: str, value: JSON, **kwargs):
         kwargs: Additional keyword arguments to pass to json.dumps.
     """
 
-    content = json.dumps(value, **kwargs).encode("utf-8")
+    content = json_dumps(value, **kwargs)
     content_type = "application/json"
 
     storage = Storage.get_instance()
@@ -167,6 +165,24 @@ def set_text(name: str, text: str):
     storage.set_bytes(name, content, content_type)
 
 
+def _guess_content_type(path: str) -> str:
+    # The guessed type only depends on the final suffix, plus the one before it
+    # when the final suffix is an encoding (e.g. ".tar.gz").
+    suffixes = Path(path).suffixes
+    suffix = suffixes[-1] if suffixes else ""
+    if len(suffixes) > 1 and (
+        suffix in mimetypes.encodings_map or suffix.lower() in mimetypes.encodings_map
+    ):
+        suffix = suffixes[-2] + suffix
+    content_type = _content_types.get(suffix)
+    if content_type is None:
+        content_type, _ = mimetypes.guess_type(path)
+        if content_type is None:
+            content_type = "application/octet-stream"
+        _content_types[suffix] = content_type
+    return content_type
+
+
 __all__ = [
     "configure",
     "list_assets",
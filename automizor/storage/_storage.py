@@ -1,9 +1,58 @@
-from typing import List, Optional
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 import requests
 
 from automizor.exceptions import AutomizorError, NotFound
-from automizor.utils import JSON, get_api_config, get_headers
+from automizor.utils import JSON, LocalSession, get_api_config, get_headers, json_loads
+
+
+class _MultipartFile:
+    """
+    A `multipart/form-data` request body that streams a file from disk in 64 KiB
+    chunks. The body has a known length, so it is sent with a `Content-Length`
+    header, and it can be iterated again when the request is retried.
+    """
+
+    def __init__(self, fields: Dict[str, str], path: Path, content_type: str):
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        self._path = path
+
+        parts = [
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{self._quote(key)}"\r\n\r\n'
+            f"{value}\r\n"
+            for key, value in fields.items()
+        ]
+        parts.append(
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="file"; filename="text.txt"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        )
+        self._preamble = "".join(parts).encode("utf-8")
+        self._epilogue = f"\r\n--{boundary}--\r\n".encode("utf-8")
+        self._length = len(self._preamble) + path.stat().st_size + len(self._epilogue)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._preamble
+        with open(self._path, "rb") as file:
+            while chunk := file.read(1 << 16):
+                yield chunk
+        yield self._epilogue
+
+    def __len__(self) -> int:
+        return self._length
+
+    @staticmethod
+    def _quote(value: str) -> str:
+        return value.replace("\r", "%0D").replace("\n", "%0A").replace('"', "%22")
 
 
 class Storage:
@@ -23,6 +72,13 @@ class Storage:
 
     - ``AUTOMIZOR_AGENT_TOKEN``: The token for authenticating against the `Automizor API`.
 
+    Optional environment variables:
+
+    - ``AUTOMIZOR_STORAGE_CACHE``: The directory where downloaded assets are cached
+      together with their ``ETag``, so unchanged assets are served locally after a
+      ``304 Not Modified`` response. Caching is disabled unless this is set, and the
+      directory is not pruned automatically.
+
     Example usage:
 
     .. code-block:: python
@@ -49,10 +105,16 @@ class Storage:
     """
 
     _instance = None
+    _lock = threading.Lock()
 
     def __init__(self, api_token: Optional[str] = None):
         self.url, self.token = get_api_config(api_token)
         self.headers = get_headers(self.token)
+        self._asset_url = f"https://{self.url}/api/v1/storage/asset/"
+        self._sessions = LocalSession()
+
+        cache_dir = os.getenv("AUTOMIZOR_STORAGE_CACHE")
+        self._cache_dir = Path(cache_dir).expanduser() if cache_dir else None
 
     @classmethod
     def configure(cls, api_token: Optional[str] = None):
@@ -61,9 +123,19 @@ class Storage:
     @classmethod
     def get_instance(cls):
         if cls._instance is None:
-            cls.configure()
+            with cls._lock:
+                if cls._instance is None:
+                    cls.configure()
         return cls._instance
 
+    @property
+    def session(self) -> requests.Session:
+        """
+        The HTTP session of the current thread.
+        """
+
+        return self._sessions.get()
+
     def list_assets(self) -> List[str]:
         """
         Retrieves a list of all asset names.
@@ -74,12 +146,12 @@ class Storage:
         Returns:
             A list of all asset names.
         """
-        url = f"https://{self.url}/api/v1/storage/asset/"
+        url = self._asset_url
         asset_names = []
 
         try:
             while url:
-                response = requests.get(url, headers=self.headers, timeout=10)
+                response = self.session.get(url, headers=self.headers, timeout=10)
                 response.raise_for_status()
                 data = response.json()
 
@@ -106,9 +178,11 @@ class Storage:
             name: The name identifier of the asset to delete.
         """
 
-        url = f"https://{self.url}/api/v1/storage/asset/{name}/"
+        self._invalidate_cache(name)
+
+        url = f"{self._asset_url}{name}/"
         try:
-            response = requests.delete(url, headers=self.headers, timeout=10)
+            response = self.session.delete(url, headers=self.headers, timeout=10)
             response.raise_for_status()
         except requests.HTTPError as exc:
             raise AutomizorError.from_response(
@@ -151,9 +225,34 @@ class Storage:
             The path to the saved file, confirming the operation's success.
         """
 
-        content = self._download_file(name, mode="content")
-        with open(path, "wb") as file:
-            file.write(content)
+        url = self._get_asset_url(name)
+        meta, headers = self._get_cache_headers(name)
+        # Download next to the destination and move it into place once complete,
+        # so an interrupted download never leaves a truncated file behind.
+        tmp_path = f"{path}.{uuid.uuid4().hex}.part"
+
+        try:
+            with self.session.get(
+                url=url, headers=headers, stream=True, timeout=10
+            ) as response:
+                if meta and response.status_code == 304:
+                    data_path, _ = self._get_cache_paths(name)
+                    shutil.copyfile(data_path, tmp_path)
+                else:
+                    response.raise_for_status()
+                    response.raw.decode_content = True
+                    with open(tmp_path, "wb") as file:
+                        shutil.copyfileobj(response.raw, file, length=1 << 16)
+                    self._write_cache(name, response, Path(tmp_path))
+            os.replace(tmp_path, path)
+        except requests.HTTPError as exc:
+            raise AutomizorError.from_response(
+                exc.response, "Failed to download asset"
+            ) from exc
+        except Exception as exc:
+            raise AutomizorError(f"Failed to download asset: {exc}") from exc
+        finally:
+            Path(tmp_path).unlink(missing_ok=True)
         return path
 
     def get_json(self, name: str) -> JSON:
@@ -204,12 +303,33 @@ class Storage:
             content_type: The MIME type of the asset content.
         """
 
+        self._invalidate_cache(name)
         try:
             self._update_asset(name, content, content_type)
         except NotFound:
             self._create_asset(name, content, content_type)
 
-    def _create_asset(self, name: str, content: bytes, content_type: str):
+    def set_file(self, name: str, path: str, content_type: str):
+        """
+        Uploads the specified file as a new asset.
+
+        This function uploads the file at `path` as an asset with the specified
+        `name`. The file is streamed from disk in chunks rather than loaded into
+        memory, which makes it suitable for large files.
+
+        Parameters:
+            name: The name identifier of the asset to create.
+            path: The filesystem path of the file to upload.
+            content_type: The MIME type of the asset content.
+        """
+
+        self._invalidate_cache(name)
+        try:
+            self._update_asset(name, Path(path), content_type)
+        except NotFound:
+            self._create_asset(name, Path(path), content_type)
+
+    def _create_asset(self, name: str, content: Union[bytes, Path], content_type: str):
         """
         Creates a new asset with the specified content.
 
@@ -219,19 +339,14 @@ class Storage:
 
         Parameters:
             name: The name identifier of the asset to create.
-            content: The raw byte content of the asset.
+            content: The raw byte content of the asset, or the path of a file to stream.
             content_type: The MIME type of the asset content.
         """
 
-        url = f"https://{self.url}/api/v1/storage/asset/"
+        url = self._asset_url
         try:
-            data = {
-                "content_type": content_type,
-                "name": name,
-            }
-            files = {"file": ("text.txt", content, content_type)}
-            response = requests.post(
-                url, headers=self.headers, files=files, data=data, timeout=10
+            response = self.session.post(
+                url, timeout=10, **self._get_upload_kwargs(name, content, content_type)
             )
             response.raise_for_status()
         except requests.HTTPError as exc:
@@ -244,17 +359,25 @@ class Storage:
     def _download_file(self, name: str, mode: str = "content"):
         url = self._get_asset_url(name)
 
+        meta, headers = self._get_cache_headers(name)
+
         try:
-            response = requests.get(url=url, timeout=10)
-            response.raise_for_status()
+            response = self.session.get(url=url, headers=headers, timeout=10)
+            if meta and response.status_code == 304:
+                data_path, _ = self._get_cache_paths(name)
+                content, encoding = data_path.read_bytes(), meta.get("encoding")
+            else:
+                response.raise_for_status()
+                content, encoding = response.content, response.encoding
+                self._write_cache(name, response, content)
 
             match mode:
                 case "content":
-                    return response.content
+                    return content
                 case "json":
-                    return response.json()
+                    return json_loads(content)
                 case "text":
-                    return response.text
+                    return content.decode(encoding or "utf-8", errors="replace")
             raise RuntimeError(f"Invalid mode {mode}")
         except requests.HTTPError as exc:
             raise AutomizorError.from_response(
@@ -263,10 +386,94 @@ class Storage:
         except Exception as exc:
             raise AutomizorError(f"Failed to download asset: {exc}") from exc
 
+    def _get_cache_headers(self, name: str) -> Tuple[Optional[dict], Dict[str, str]]:
+        if self._cache_dir is None:
+            return None, {}
+
+        data_path, meta_path = self._get_cache_paths(name)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None, {}
+        if not data_path.is_file():
+            return None, {}
+
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return (meta, headers) if headers else (None, {})
+
+    def _get_cache_paths(self, name: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(f"{self.url}/{name}".encode("utf-8")).hexdigest()
+        return self._cache_dir / f"{key}.bin", self._cache_dir / f"{key}.meta"
+
+    def _invalidate_cache(self, name: str):
+        if self._cache_dir is None:
+            return
+
+        for cache_path in self._get_cache_paths(name):
+            try:
+                cache_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def _write_cache(
+        self, name: str, response: requests.Response, content: Union[bytes, Path]
+    ):
+        if self._cache_dir is None:
+            return
+
+        meta = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "encoding": response.encoding,
+        }
+        if not meta["etag"] and not meta["last_modified"]:
+            self._invalidate_cache(name)
+            return
+
+        data_path, meta_path = self._get_cache_paths(name)
+        tmp_path = self._cache_dir / f"{uuid.uuid4().hex}.tmp"
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            meta_path.unlink(missing_ok=True)
+            if isinstance(content, Path):
+                shutil.copyfile(content, tmp_path)
+            else:
+                tmp_path.write_bytes(content)
+            os.replace(tmp_path, data_path)
+
+            tmp_path.write_text(json.dumps(meta), encoding="utf-8")
+            os.replace(tmp_path, meta_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            self._invalidate_cache(name)
+
+    def _get_upload_kwargs(
+        self, name: str, content: Union[bytes, Path], content_type: str
+    ) -> dict:
+        data = {
+            "content_type": content_type,
+            "name": name,
+        }
+        if isinstance(content, Path):
+            body = _MultipartFile(data, content, content_type)
+            headers = {
+                **self.headers,
+                "Content-Length": str(len(body)),
+                "Content-Type": body.content_type,
+            }
+            return {"data": body, "headers": headers}
+
+        files = {"file": ("text.txt", content, content_type)}
+        return {"data": data, "files": files, "headers": self.headers}
+
     def _get_asset_url(self, name: str) -> str:
-        url = f"https://{self.url}/api/v1/storage/asset/{name}/"
+        url = f"{self._asset_url}{name}/"
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, headers=self.headers, timeout=10)
             response.raise_for_status()
 
             url = response.json().get("file")
@@ -280,7 +487,7 @@ class Storage:
         except Exception as exc:
             raise AutomizorError(f"Failed to get asset URL: {exc}") from exc
 
-    def _update_asset(self, name: str, content: bytes, content_type: str):
+    def _update_asset(self, name: str, content: Union[bytes, Path], content_type: str):
         """
         Updates the specified asset with new content.
 
@@ -290,19 +497,14 @@ class Storage:
 
         Parameters:
             name: The name identifier of the asset to update.
-            content: The raw byte content of the asset.
+            content: The raw byte content of the asset, or the path of a file to stream.
             content_type: The MIME type of the asset content.
         """
 
-        url = f"https://{self.url}/api/v1/storage/asset/{name}/"
+        url = f"{self._asset_url}{name}/"
         try:
-            data = {
-                "content_type": content_type,
-                "name": name,
-            }
-            files = {"file": ("text.txt", content, content_type)}
-            response = requests.put(
-                url, headers=self.headers, files=files, data=data, timeout=10
+            response = self.session.put(
+                url, timeout=10, **self._get_upload_kwargs(name, content, content_type)
             )
             response.raise_for_status()
         except requests.HTTPError as exc:
@@ -1,10 +1,21 @@
+import json
 import os
 import platform
-from typing import Dict, List, Optional, Union
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from automizor import version
 from automizor.exceptions import AutomizorError
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 JSON = Union[str, int, float, bool, None, Dict[str, "JSON"], List["JSON"]]
 
 
@@ -32,3 +43,81 @@ def get_headers(token: str) -> dict:
         "Authorization": f"Token {token}",
         "User-Agent": f"Automizor/{version} {OS_SYSTEM}/{OS_RELEASE}",
     }
+
+
+def get_session() -> requests.Session:
+    retry = Retry(
+        total=3,
+        backoff_factor=0.25,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["DELETE", "GET", "PUT"]),
+        raise_on_status=False,
+        respect_retry_after_header=False,
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class LocalSession:
+    """
+    Provides one `requests.Session` per thread, created lazily with `get_session`.
+    A session must not be shared between threads, as concurrent use of its pooled
+    SSL sockets can corrupt the stream.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def get(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = get_session()
+            self._local.session = session
+        return session
+
+
+def json_dumps(value: Any, **kwargs) -> bytes:
+    """
+    Encodes `value` as UTF-8 JSON. orjson is used when it is installed and no
+    `json.dumps` keyword arguments are given; values it cannot encode natively
+    (datetimes, dataclasses, subclasses of built-in types, non-str keys, integers
+    wider than 64 bits) fall back to the stdlib, which accepts or rejects them as
+    before. With orjson, NaN and Infinity are encoded as ``null`` rather than the
+    stdlib's non-standard ``NaN``/``Infinity``, UUID and Enum values are encoded
+    natively, and whitespace and non-ASCII escaping differ.
+    """
+
+    if orjson is not None and not kwargs:
+        try:
+            return orjson.dumps(
+                value,
+                default=_reject_json_value,
+                option=orjson.OPT_PASSTHROUGH_DATACLASS
+                | orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_SUBCLASS,
+            )
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(value, **kwargs).encode("utf-8")
+
+
+def json_loads(data: Union[bytes, str]) -> JSON:
+    """
+    Decodes JSON from `data`. Input orjson rejects but the stdlib accepts, such
+    as ``NaN`` or UTF-16 bodies, is decoded by the stdlib.
+    """
+
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _reject_json_value(value: Any):
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from ._container import SecretContainer
 from ._vault import Vault
@@ -60,6 +60,25 @@ def get_secret(name: str) -> SecretContainer:
     return vault.get_secret(name)
 
 
+def get_secrets(names: List[str]) -> List[SecretContainer]:
+    """
+    Retrieves multiple secrets by their names. Fetches them concurrently
+    from the `Automizor API`.
+
+    Args:
+        names: The names of the secrets to retrieve.
+
+    Returns:
+        The retrieved secrets, in the same order as `names`.
+
+    Raises:
+        AutomizorVaultError: If retrieving any of the secrets fails.
+    """
+
+    vault = Vault.get_instance()
+    return vault.get_secrets(names)
+
+
 def set_secret(secret: SecretContainer) -> SecretContainer:
     """
     Updates an existing secret. Updates to the `Automizor API`.
@@ -83,5 +102,6 @@ __all__ = [
     "configure",
     "create_secret",
     "get_secret",
+    "get_secrets",
     "set_secret",
 ]
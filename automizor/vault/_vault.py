@@ -1,13 +1,27 @@
-from dataclasses import asdict
-from typing import Optional
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields
+from typing import Dict, List, Optional, Tuple
 
 import requests
 
 from automizor.exceptions import AutomizorError, NotFound
-from automizor.utils import get_api_config, get_headers
+from automizor.utils import (
+    LocalSession,
+    get_api_config,
+    get_headers,
+    json_dumps,
+    json_loads,
+)
 
 from ._container import SecretContainer
 
+_SECRET_FIELDS = tuple(field.name for field in fields(SecretContainer))
+
 
 class Vault:
     """
@@ -23,6 +37,10 @@ class Vault:
     Environment variables requisite for operation include:
     - ``AUTOMIZOR_AGENT_TOKEN``: The token for authenticating against the `Automizor API`.
 
+    Optional environment variables:
+    - ``AUTOMIZOR_VAULT_CACHE_TTL``: Seconds a retrieved secret is served from the
+      in-memory cache before it is fetched again (default ``60``, ``0`` disables it).
+
     Example usage:
 
     .. code-block:: python
@@ -37,6 +55,9 @@ class Vault:
         print(secret.get("username"))  # Output: "admin"
         print(secret.get("password"))  # Output: "*****"
 
+        # Retrieve several secrets at once
+        my_secret, my_api_key = vault.get_secrets(["my_secret", "my_api_key"])
+
         # Update a existing secret
         secret = vault.get_secret("my_secret")
         secret.update({"username": "user"})
@@ -44,21 +65,74 @@ class Vault:
     """
 
     _instance = None
+    _lock = threading.Lock()
+    _cache_size = 128
+    _max_workers = 16
 
     def __init__(self, api_token: Optional[str] = None):
         self.url, self.token = get_api_config(api_token)
         self.headers = get_headers(self.token)
+        self._secret_url = f"https://{self.url}/api/v1/vault/secret/"
+        self._sessions = LocalSession()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+        try:
+            self._cache_ttl = float(os.getenv("AUTOMIZOR_VAULT_CACHE_TTL", "60"))
+        except ValueError as exc:
+            raise AutomizorError(
+                "AUTOMIZOR_VAULT_CACHE_TTL is not a valid number."
+            ) from exc
+        self._cache: "OrderedDict[str, Tuple[float, SecretContainer]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Maps names with fetches in flight to [number of fetches, write version].
+        self._cache_pending: Dict[str, List[int]] = {}
 
     @classmethod
     def configure(cls, api_token: Optional[str] = None):
-        cls._instance = cls(api_token)
+        previous, cls._instance = cls._instance, cls(api_token)
+        if previous is not None:
+            previous._shutdown_executor()
 
     @classmethod
     def get_instance(cls):
         if cls._instance is None:
-            cls.configure()
+            with cls._lock:
+                if cls._instance is None:
+                    cls.configure()
         return cls._instance
 
+    @property
+    def session(self) -> requests.Session:
+        """
+        The HTTP session of the current thread.
+        """
+
+        return self._sessions.get()
+
+    def clear_cache(self):
+        """
+        Removes all secrets from the in-memory cache.
+        """
+
+        with self._cache_lock:
+            self._cache.clear()
+            for pending in self._cache_pending.values():
+                pending[1] += 1
+
+    def invalidate(self, name: str):
+        """
+        Removes a secret from the in-memory cache, so that the next retrieval
+        fetches it from the `Automizor API` again.
+
+        Args:
+            name: The name of the secret to invalidate.
+        """
+
+        with self._cache_lock:
+            self._cache.pop(name, None)
+            self._cache_touch(name)
+
     def create_secret(self, secret: SecretContainer) -> SecretContainer:
         """
         Creates a new secret. Stores the secret in the `Automizor API`.
@@ -75,13 +149,20 @@ class Vault:
         """
 
         try:
-            return self._update_secret(secret)
-        except NotFound:
-            return self._create_secret(secret)
+            try:
+                secret = self._update_secret(secret)
+            except NotFound:
+                secret = self._create_secret(secret)
+        except AutomizorError:
+            self.invalidate(secret.name)
+            raise
+        self._cache_set(secret)
+        return secret
 
     def get_secret(self, name) -> SecretContainer:
         """
-        Retrieves a secret by its name. Fetches from the `Automizor API`.
+        Retrieves a secret by its name. Fetches from the `Automizor API`,
+        unless a cached copy younger than the cache TTL is available.
 
         Args:
             name: The name of the secret to retrieve.
@@ -93,7 +174,51 @@ class Vault:
             AutomizorVaultError: If retrieving the secret fails.
         """
 
-        return self._get_secret(name)
+        cached = self._cache_get(name)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        version = self._cache_begin_fetch(name)
+        secret = None
+        try:
+            secret = self._get_secret(name)
+        finally:
+            self._cache_end_fetch(name, version, secret)
+        return secret
+
+    def get_secrets(self, names: List[str]) -> List[SecretContainer]:
+        """
+        Retrieves multiple secrets by their names. The secrets are fetched from
+        the `Automizor API` concurrently, so the total latency is close to that
+        of a single request rather than one round-trip per secret. Duplicate
+        names are only fetched once.
+
+        Args:
+            names: The names of the secrets to retrieve.
+
+        Returns:
+            The retrieved secrets, in the same order as `names`.
+
+        Raises:
+            AutomizorVaultError: If retrieving any of the secrets fails.
+        """
+
+        if not names:
+            return []
+
+        unique_names = list(dict.fromkeys(names))
+        executor = self._get_executor()
+        secrets = dict(zip(unique_names, executor.map(self.get_secret, unique_names)))
+
+        # Repeated names get their own copy, so that each returned secret can be
+        # modified independently, as with separate `get_secret` calls.
+        results = []
+        seen = set()
+        for name in names:
+            secret = secrets[name]
+            results.append(copy.deepcopy(secret) if name in seen else secret)
+            seen.add(name)
+        return results
 
     def set_secret(self, secret: SecretContainer) -> SecretContainer:
         """
@@ -109,16 +234,96 @@ class Vault:
             AutomizorVaultError: If updating the secret fails.
         """
 
-        return self._update_secret(secret)
+        try:
+            secret = self._update_secret(secret)
+        except AutomizorError:
+            self.invalidate(secret.name)
+            raise
+        self._cache_set(secret)
+        return secret
+
+    @staticmethod
+    def _serialize(secret: SecretContainer) -> dict:
+        return {name: getattr(secret, name) for name in _SECRET_FIELDS}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # The pool outlives a single call, so its worker threads keep their
+        # per-thread sessions and connections across calls.
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._max_workers,
+                        thread_name_prefix="automizor-vault",
+                    )
+        return self._executor
+
+    def _shutdown_executor(self):
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _cache_get(self, name: str) -> Optional[SecretContainer]:
+        with self._cache_lock:
+            entry = self._cache.get(name)
+            if entry is None:
+                return None
+            timestamp, secret = entry
+            if time.monotonic() - timestamp >= self._cache_ttl:
+                del self._cache[name]
+                return None
+            self._cache.move_to_end(name)
+            return secret
+
+    def _cache_begin_fetch(self, name: str) -> int:
+        with self._cache_lock:
+            pending = self._cache_pending.setdefault(name, [0, 0])
+            pending[0] += 1
+            return pending[1]
+
+    def _cache_end_fetch(
+        self, name: str, version: int, secret: Optional[SecretContainer]
+    ):
+        with self._cache_lock:
+            pending = self._cache_pending[name]
+            pending[0] -= 1
+            if pending[0] == 0:
+                del self._cache_pending[name]
+            # A write or invalidation of this name during the fetch makes the
+            # fetched value stale, so it must not replace the newer entry.
+            if secret is not None and pending[1] == version:
+                self._cache_store(secret)
+
+    def _cache_set(self, secret: SecretContainer):
+        with self._cache_lock:
+            self._cache_touch(secret.name)
+            self._cache_store(secret)
+
+    def _cache_store(self, secret: SecretContainer):
+        if self._cache_ttl <= 0:
+            return
+        self._cache[secret.name] = (time.monotonic(), copy.deepcopy(secret))
+        self._cache.move_to_end(secret.name)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _cache_touch(self, name: str):
+        pending = self._cache_pending.get(name)
+        if pending is not None:
+            pending[1] += 1
 
     def _create_secret(self, secret: SecretContainer) -> SecretContainer:
-        url = f"https://{self.url}/api/v1/vault/secret/"
+        url = self._secret_url
         try:
-            response = requests.post(
-                url, headers=self.headers, timeout=10, json=asdict(secret)
+            response = self.session.post(
+                url,
+                headers={**self.headers, "Content-Type": "application/json"},
+                timeout=10,
+                data=json_dumps(self._serialize(secret)),
             )
             response.raise_for_status()
-            return SecretContainer(**response.json())
+            return SecretContainer(**json_loads(response.content))
         except requests.HTTPError as exc:
             raise AutomizorError.from_response(
                 exc.response, "Failed to create secret"
@@ -127,11 +332,11 @@ class Vault:
             raise AutomizorError(f"Failed to create secret: {exc}") from exc
 
     def _get_secret(self, name: str) -> SecretContainer:
-        url = f"https://{self.url}/api/v1/vault/secret/{name}/"
+        url = f"{self._secret_url}{name}/"
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, headers=self.headers, timeout=10)
             response.raise_for_status()
-            return SecretContainer(**response.json())
+            return SecretContainer(**json_loads(response.content))
         except requests.HTTPError as exc:
             raise AutomizorError.from_response(
                 exc.response, "Failed to get secret"
@@ -140,13 +345,16 @@ class Vault:
             raise AutomizorError(f"Failed to get secret: {exc}") from exc
 
     def _update_secret(self, secret: SecretContainer) -> SecretContainer:
-        url = f"https://{self.url}/api/v1/vault/secret/{secret.name}/"
+        url = f"{self._secret_url}{secret.name}/"
         try:
-            response = requests.put(
-                url, headers=self.headers, timeout=10, json=asdict(secret)
+            response = self.session.put(
+                url,
+                headers={**self.headers, "Content-Type": "application/json"},
+                timeout=10,
+                data=json_dumps(self._serialize(secret)),
             )
             response.raise_for_status()
-            return SecretContainer(**response.json())
+            return SecretContainer(**json_loads(response.content))
         except requests.HTTPError as exc:
             raise AutomizorError.from_response(
                 exc.response, "Failed to update secret"
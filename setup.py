@@ -25,4 +25,7 @@ setup(
     install_requires=[
         "requests",
     ],
+    extras_require={
+        "orjson": ["orjson"],
+    },
 )